@@ -13,7 +13,7 @@ This file does exactly 4 conceptual steps:
        * Relationship types (Aggregates, Containment, Adjacency, Intersection)
 
 2. Scan the IFC STEP and choose only the chosen types
-   - We read the IFC STEP text.
+   - We stream the IFC STEP text in chunks (the file is never fully in memory).
    - We detect lines of the form: #id = IFCTYPE(...);
    - We KEEP ONLY:
        * spatial entities we care about
@@ -21,8 +21,8 @@ This file does exactly 4 conceptual steps:
        * relationship entities we care about
 
 3. Parse and get the string (no BOT semantics yet)
-   - We turn each relevant line into a neutral Python object:
-       * IfcEntity(id, type, name, global_id)
+   - We turn each relevant line into neutral Python data:
+       * an EntityTable row (id, type, name, global_id) per entity
        * IfcRelationship(id, type, parent_id, child_ids)
    - At this point we still speak "IFC language", not "BOT language".
 
@@ -34,9 +34,25 @@ This file does exactly 4 conceptual steps:
 ==========================================================
 """
 
+import codecs
+import gzip
+import io
+import mmap
+import os
 import re
-from collections import defaultdict
-from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+from operator import attrgetter
+from enum import IntEnum
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional, Set,
+                    TextIO, Tuple, Union)
+
+try:
+    # Optional: Intel Hyperscan (pip install hyperscan) — a DFA-based,
+    # SIMD-accelerated multi-pattern scanner. Without it we use `re`.
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 
 # ==========================================================
@@ -101,12 +117,234 @@ IFC_TYPES_OF_INTEREST = (
     | {"IFCPROJECT"}  # often useful as root, though not mapped to BOT
 )
 
+# 1.4 Small integer code per IFC type
+#     Assigned once at parse time, so the triple loops compare ints instead
+#     of strings. Generated from the mappings above (zones first, then
+#     elements, IFCPROJECT, relationships), so extending a mapping is enough.
+TypeCode = IntEnum(
+    "TypeCode",
+    list(IFC_TO_BOT_ZONE)
+    + list(IFC_TO_BOT_ELEMENT)
+    + ["IFCPROJECT"]
+    + list(IFC_REL_TO_BOT_PROP),
+)
+
+_TYPE_LOOKUP: Dict[str, TypeCode] = {code.name: code for code in TypeCode}
+
+ZONE_CODES = frozenset(TypeCode[t] for t in IFC_TO_BOT_ZONE)
+ELEMENT_CODES = frozenset(TypeCode[t] for t in IFC_TO_BOT_ELEMENT)
+ENTITY_CODES = ZONE_CODES | ELEMENT_CODES | {TypeCode.IFCPROJECT}
+RELATIONSHIP_CODES = frozenset(TypeCode[t] for t in IFC_REL_TO_BOT_PROP)
+
+# Byte lookup tables indexed by type code: 1 if the code is a zone /
+# an element. One byte load per entity instead of a set lookup.
+ZONE_MASK = bytes(code in ZONE_CODES for code in range(max(TypeCode) + 1))
+ELEMENT_MASK = bytes(code in ELEMENT_CODES
+                     for code in range(max(TypeCode) + 1))
+
+# BOT class per type code (IFCPROJECT and relationships have none)
+BOT_CLASS_BY_CODE: Dict[TypeCode, str] = {
+    TypeCode[t]: bot_class
+    for t, bot_class in {**IFC_TO_BOT_ZONE, **IFC_TO_BOT_ELEMENT}.items()
+}
+
 
 # ==========================================================
 # STEP 2 — SCAN IFC STEP AND SELECT ONLY RELEVANT LINES
 # ==========================================================
 
-def scan_ifc_and_extract_lines(ifc_text: str) -> List[Tuple[int, str, str]]:
+# Regex:
+#   group(1) = id
+#   group(2) = IFCTYPE (only the types in IFC_TYPES_OF_INTEREST)
+#   group(3) = arguments inside parentheses (multi-line allowed)
+#
+# The type is an alternation of the types we care about (longest first, so
+# IFCWALLSTANDARDCASE wins over IFCWALL). Lines such as IFCCARTESIANPOINT /
+# IFCDIRECTION — the vast majority of a typical file — are rejected by the
+# regex right after the "=" instead of being matched and discarded in Python.
+#
+# The match is case-sensitive: ISO 10303-21 requires entity keywords to be
+# upper-case and every IFC exporter writes them that way, so group(2) can be
+# used as-is (no re.IGNORECASE, no .upper() per match). _scan_chunks()
+# checks the keyword of the first statement once, and only a file that is
+# not upper-case is scanned with IFC_LINE_PATTERN_ANY_CASE instead.
+IFC_LINE_PATTERN = re.compile(
+    r"#(\d+)\s*=\s*("
+    + "|".join(sorted(IFC_TYPES_OF_INTEREST, key=len, reverse=True))
+    + r")\s*\((.*?)\);",
+    re.DOTALL
+)
+IFC_LINE_PATTERN_ANY_CASE = re.compile(
+    IFC_LINE_PATTERN.pattern, re.DOTALL | re.IGNORECASE
+)
+
+# The keyword of a statement head "#<id> = <KEYWORD>"
+_RE_HEAD_KEYWORD = re.compile(r"#\d+\s*=\s*([A-Za-z]\w*)")
+
+# How much of the IFC file we read at a time when streaming (1 MiB).
+IFC_READ_CHUNK_SIZE = 1 << 20
+
+
+def _scan_statements_re(ifc_text: str) -> Iterator[Tuple[int, str, str]]:
+    """
+    Portable scan engine: Python's `re` module with IFC_LINE_PATTERN.
+
+    findall() walks the text once and builds the (id, type, args) group
+    tuples in C, so no match object is created per statement.
+    """
+    for ent_id_str, ent_type, args_str in IFC_LINE_PATTERN.findall(ifc_text):
+        yield int(ent_id_str), ent_type, args_str
+
+
+def _scan_statements_any_case(ifc_text: str) -> Iterator[Tuple[int, str, str]]:
+    """
+    Scan engine for files whose keywords are not upper-case: like
+    _scan_statements_re(), but case-insensitive, and the type is
+    upper-cased so it still matches the mapping tables.
+    """
+    for ent_id_str, ent_type, args_str in \
+            IFC_LINE_PATTERN_ANY_CASE.findall(ifc_text):
+        yield int(ent_id_str), ent_type.upper(), args_str
+
+
+def _build_hyperscan_database():
+    """
+    Compile one Hyperscan pattern per IFC type of interest.
+
+    Each pattern only matches the statement head "#<id> = <IFCTYPE>(",
+    and its pattern id is the index of the type in the returned list,
+    so a match tells us the type for free. Like IFC_LINE_PATTERN, the
+    patterns are case-sensitive.
+    """
+    ifc_types = sorted(IFC_TYPES_OF_INTEREST)
+    expressions = [
+        rb"#[0-9]+\s*=\s*" + ifc_type.encode("ascii") + rb"\s*\("
+        for ifc_type in ifc_types
+    ]
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_SOM_LEFTMOST,
+    )
+    return database, ifc_types
+
+
+def _scan_statements_hyperscan(ifc_text: str) -> Iterator[Tuple[int, str, str]]:
+    """
+    Hyperscan scan engine.
+
+    Hyperscan gives us (start, end) offsets of every statement head in a
+    single pass over the bytes. We then slice around each offset:
+        start+1 .. '='   → id
+        end     .. ');'  → raw args string
+    Heads that fall inside the args of a previous statement are skipped,
+    which mirrors the non-overlapping behaviour of re.finditer().
+    """
+    data = ifc_text.encode("utf-8")
+    heads: List[Tuple[int, int, int]] = []
+
+    def on_match(type_index, start, end, flags, context):
+        heads.append((start, end, type_index))
+
+    _HS_DATABASE.scan(data, match_event_handler=on_match)
+    heads.sort()
+
+    scanned_until = 0
+    for start, end, type_index in heads:
+        if start < scanned_until:
+            continue
+        args_end = data.find(b");", end)
+        if args_end < 0:
+            break
+        scanned_until = args_end + 2
+
+        ent_id = int(data[start + 1:data.index(b"=", start)])
+        args_str = data[end:args_end].decode("utf-8")
+        yield ent_id, _HS_IFC_TYPES[type_index], args_str
+
+
+# Pick the scan engine once, at import time.
+if hyperscan is not None:
+    _HS_DATABASE, _HS_IFC_TYPES = _build_hyperscan_database()
+    _scan_statements = _scan_statements_hyperscan
+else:
+    _scan_statements = _scan_statements_re
+
+
+# A statement head "#<id> =". It only counts as the start of a statement
+# when it follows a newline or the ';' of the previous statement (with
+# optional blanks in between), as STEP does not require line breaks.
+_RE_STATEMENT_HEAD = re.compile(r"#\d+\s*=")
+
+
+def _last_statement_start(text: str) -> int:
+    """
+    Offset of the '#' of the last statement head in `text` that follows
+    a newline or a ';', or 0 if there is none.
+    """
+    pos = text.rfind("#")
+    while pos > 0:
+        if _RE_STATEMENT_HEAD.match(text, pos):
+            before = pos - 1
+            while before >= 0 and text[before] in " \t\r":
+                before -= 1
+            if before >= 0 and text[before] in "\n;":
+                return pos
+        pos = text.rfind("#", 0, pos)
+    return 0
+
+
+def _pick_scan_engine(
+    text: str
+) -> Optional[Callable[[str], Iterator[Tuple[int, str, str]]]]:
+    """
+    Pick the scan engine from the keyword of the first statement head in
+    `text`: the usual one if it is upper-case, _scan_statements_any_case()
+    otherwise. None while `text` holds no complete keyword yet.
+    """
+    m_head = _RE_HEAD_KEYWORD.search(text)
+    if m_head is None or m_head.end() == len(text):
+        return None
+    if m_head.group(1).isupper():
+        return _scan_statements
+    return _scan_statements_any_case
+
+
+def _scan_chunks(chunks: Iterable[str]) -> Iterator[Tuple[int, str, str]]:
+    """
+    Run the scan engine over a sequence of text chunks.
+
+    - We only scan up to the last statement head "#<id> =" that follows
+      a newline or a ';', because the statement it opens may not be
+      complete yet. A bare ';' is not a safe cut: it can sit inside a
+      quoted name.
+    - That last statement is kept and scanned again once the next chunk
+      arrives. Statements we do not care about never match, so everything
+      before the head can be dropped, not just up to the last match.
+    - Whatever is left when the chunks run out is scanned as-is.
+    - The scan engine is picked once, from the first statement head
+      (see _pick_scan_engine()).
+    """
+    buffer = ""
+    scan = None
+
+    for chunk in chunks:
+        buffer += chunk
+        if scan is None:
+            scan = _pick_scan_engine(buffer)
+            if scan is None:
+                continue
+        scan_end = _last_statement_start(buffer)
+        if scan_end:
+            yield from scan(buffer[:scan_end])
+            buffer = buffer[scan_end:]
+
+    yield from (scan or _scan_statements)(buffer)
+
+
+def scan_ifc_and_extract_lines(ifc_text: str) -> Iterator[Tuple[int, str, str]]:
     """
     Scan the IFC STEP text and extract ONLY the lines of the form:
 
@@ -114,33 +352,34 @@ def scan_ifc_and_extract_lines(ifc_text: str) -> List[Tuple[int, str, str]]:
 
     where IFCTYPE is in IFC_TYPES_OF_INTEREST.
 
-    Returns a list of tuples:
+    Yields tuples:
         (id, ifc_type, raw_args_string)
 
-    This step is still "IFC world", no BOT semantics yet.
-    """
+    This is a generator: feed it straight into parse_selected_ifc_lines()
+    and no list of selected lines (with all their args strings) is ever
+    built. The text is scanned IFC_READ_CHUNK_SIZE characters at a time,
+    exactly like a file streamed by iter_ifc_statements().
 
-    # Regex:
-    #   group(1) = id
-    #   group(2) = IFCTYPE
-    #   group(3) = arguments inside parentheses (multi-line allowed)
-    pattern = re.compile(
-        r"#(\d+)\s*=\s*(\w+)\s*\((.*?)\);",
-        re.IGNORECASE | re.DOTALL
-    )
+    The scan engine is Hyperscan when it is installed, `re` otherwise;
+    both return the same tuples.
 
-    results: List[Tuple[int, str, str]] = []
+    This step is still "IFC world", no BOT semantics yet.
+    """
+    chunks = (ifc_text[i:i + IFC_READ_CHUNK_SIZE]
+              for i in range(0, len(ifc_text), IFC_READ_CHUNK_SIZE))
+    yield from _scan_chunks(chunks)
 
-    for match in pattern.finditer(ifc_text):
-        ent_id_str, ent_type_raw, args_str = match.groups()
-        ent_id = int(ent_id_str)
-        ent_type = ent_type_raw.upper()
 
-        # Only keep IFC types we explicitly care about
-        if ent_type in IFC_TYPES_OF_INTEREST:
-            results.append((ent_id, ent_type, args_str))
+def iter_ifc_statements(ifc_path: str) -> Iterator[Tuple[int, str, str]]:
+    """
+    Streaming version of scan_ifc_and_extract_lines() that reads
+    the IFC file from disk chunk by chunk.
 
-    return results
+    Yields the same (id, ifc_type, raw_args_string) tuples, but only
+    ever keeps about one chunk of the file in memory.
+    """
+    with open(ifc_path, "r", encoding="utf-8", errors="ignore") as f:
+        yield from _scan_chunks(iter(lambda: f.read(IFC_READ_CHUNK_SIZE), ""))
 
 
 # ==========================================================
@@ -155,20 +394,25 @@ class IfcEntity:
 
     We only store:
         - id        : 30
-        - type      : 'IFCBUILDING'
+        - type      : TypeCode.IFCBUILDING
         - name      : 'Main Building'
         - global_id : 'BLDG-001'
+
+    __slots__ keeps instances small (no per-instance __dict__), which
+    matters when a building has hundreds of thousands of entities.
     """
 
-    def __init__(self, ent_id: int, ent_type: str,
+    __slots__ = ("id", "type", "name", "global_id")
+
+    def __init__(self, ent_id: int, ent_type: TypeCode,
                  name: str = "", global_id: str = ""):
         self.id = ent_id
-        self.type = ent_type.upper()
+        self.type = ent_type
         self.name = name
         self.global_id = global_id
 
     def __repr__(self) -> str:
-        return f"IfcEntity(#{self.id}, {self.type}, name={self.name!r})"
+        return f"IfcEntity(#{self.id}, {self.type.name}, name={self.name!r})"
 
 
 class IfcRelationship:
@@ -179,65 +423,336 @@ class IfcRelationship:
 
     We only store:
         - id        : 100
-        - type      : 'IFCRELAGGREGATES'
+        - type      : TypeCode.IFCRELAGGREGATES
         - parent_id : 20
         - child_ids : [30, 40]
     """
 
-    def __init__(self, rel_id: int, rel_type: str,
+    __slots__ = ("id", "type", "parent_id", "child_ids")
+
+    def __init__(self, rel_id: int, rel_type: TypeCode,
                  parent_id: int, child_ids: List[int]):
         self.id = rel_id
-        self.type = rel_type.upper()
+        self.type = rel_type
         self.parent_id = parent_id
         self.child_ids = child_ids
 
     def __repr__(self) -> str:
-        return (f"IfcRelationship(#{self.id}, {self.type}, "
+        return (f"IfcRelationship(#{self.id}, {self.type.name}, "
                 f"parent={self.parent_id}, children={self.child_ids})")
 
 
+# Args patterns, compiled once for the whole parse
+#   _RE_TWO_STRINGS: first two string attributes 'GLOBALID','NAME',...
+#   _RE_HASHNUM:     an entity reference #<id>
+_RE_TWO_STRINGS = re.compile(r"'([^']*)'\s*,\s*'([^']*)'")
+_RE_HASHNUM = re.compile(r"#(\d+)")
+
+
+def _rfind_unquoted(args_str: str, sub: str, end: int) -> int:
+    """
+    Like args_str.rfind(sub, 0, end), but skips matches inside a quoted
+    string (an odd number of quotes before them). STEP escapes a quote
+    inside a string as '', so the count stays even outside strings.
+    """
+    idx = args_str.rfind(sub, 0, end)
+    while idx >= 0 and args_str.count("'", 0, idx) % 2:
+        idx = args_str.rfind(sub, 0, idx)
+    return idx
+
+
+def _relationship_ids(args_str: str) -> Optional[Tuple[int, List[int]]]:
+    """
+    Extract (parent_id, child_ids) from the args of a relationship.
+
+    IFC relationships list their parent and children as:
+        ...,#parent,(#c1,#c2,...)
+    so we only scan the LAST tuple for the children, and search
+    backwards from its '(' for the parent reference, instead of
+    collecting every #number in the whole args string. Brackets and
+    '#' inside quoted names such as 'Join (N-E)' are not looked at.
+
+    Args without a tuple fall back to "first #number is the parent,
+    the remaining ones are the children".
+    """
+    open_idx = _rfind_unquoted(args_str, "(", len(args_str))
+
+    if open_idx < 0:
+        nums = _RE_HASHNUM.findall(args_str)
+        if len(nums) < 2:
+            return None
+        return int(nums[0]), [int(n) for n in nums[1:]]
+
+    close_idx = args_str.find(")", open_idx)
+    if close_idx < 0:
+        close_idx = len(args_str)
+    child_ids = [int(n) for n in
+                 _RE_HASHNUM.findall(args_str, open_idx, close_idx)]
+
+    hash_idx = _rfind_unquoted(args_str, "#", open_idx)
+    m_parent = _RE_HASHNUM.match(args_str, hash_idx) if hash_idx >= 0 else None
+    if m_parent is None or not child_ids:
+        return None
+    return int(m_parent.group(1)), child_ids
+
+
+class EntityTable:
+    """
+    All parsed IFC entities, stored column-wise (one array per field)
+    instead of one IfcEntity object per entity:
+
+        ids        : array('q')  IFC ids (64-bit: ids may exceed 2**31)
+        type_codes : array('b')  TypeCode per entity (1 byte each)
+        names      : list[str]
+        global_ids : list[str]
+        id_to_idx  : { ifc_id → row index }
+
+    Step 4 mostly needs ids + type codes, and those are two compact
+    arrays it can walk without touching names or global ids.
+    table[ifc_id] still gives an IfcEntity for a single entity.
+    """
+
+    __slots__ = ("ids", "type_codes", "names", "global_ids", "id_to_idx")
+
+    def __init__(self):
+        self.ids = array("q")
+        self.type_codes = array("b")
+        self.names: List[str] = []
+        self.global_ids: List[str] = []
+        self.id_to_idx: Dict[int, int] = {}
+
+    def add(self, ent_id: int, ent_type: TypeCode,
+            name: str = "", global_id: str = "") -> None:
+        """
+        Append one entity. A repeated id overwrites the earlier row
+        (same as assigning into a dict).
+        """
+        idx = self.id_to_idx.get(ent_id)
+        if idx is None:
+            self.id_to_idx[ent_id] = len(self.ids)
+            self.ids.append(ent_id)
+            self.type_codes.append(ent_type)
+            self.names.append(name)
+            self.global_ids.append(global_id)
+        else:
+            self.type_codes[idx] = ent_type
+            self.names[idx] = name
+            self.global_ids[idx] = global_id
+
+    def extend(self, other: "EntityTable") -> None:
+        """
+        Append all rows of another table (e.g. one parsed by a worker
+        process). Without shared ids this is a bulk array/list extend.
+        """
+        if not self.id_to_idx.keys().isdisjoint(other.id_to_idx):
+            for ent_id, code, name, global_id in zip(
+                    other.ids, other.type_codes, other.names,
+                    other.global_ids):
+                self.add(ent_id, code, name, global_id)
+            return
+
+        offset = len(self.ids)
+        self.id_to_idx.update(
+            zip(other.ids, range(offset, offset + len(other.ids))))
+        self.ids.extend(other.ids)
+        self.type_codes.extend(other.type_codes)
+        self.names.extend(other.names)
+        self.global_ids.extend(other.global_ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, ent_id: int) -> bool:
+        return ent_id in self.id_to_idx
+
+    def __getitem__(self, ent_id: int) -> IfcEntity:
+        idx = self.id_to_idx[ent_id]
+        return IfcEntity(ent_id, TypeCode(self.type_codes[idx]),
+                         self.names[idx], self.global_ids[idx])
+
+    def id_flags(self, max_ref_id: int) -> Tuple["IdFlags", "IdFlags"]:
+        """
+        Per-id zone / element flags, for every id up to max_ref_id:
+            zone_flags[ifc_id]    → 1 if ifc_id is a zone, else 0
+            element_flags[ifc_id] → 1 if ifc_id is an element, else 0
+
+        IFC ids are usually close to contiguous, so while max_ref_id is
+        below DENSE_ID_FACTOR × (number of entities) the flags are
+        bytearrays indexed by id (1 byte per id). Sparser ids use dicts
+        holding only the flagged ids instead.
+        """
+        if max_ref_id < DENSE_ID_FACTOR * len(self.ids):
+            zone_flags = bytearray(max_ref_id + 1)
+            element_flags = bytearray(max_ref_id + 1)
+            for ent_id, code in zip(self.ids, self.type_codes):
+                zone_flags[ent_id] = ZONE_MASK[code]
+                element_flags[ent_id] = ELEMENT_MASK[code]
+            return zone_flags, element_flags
+
+        zone_flags = _SparseIdFlags()
+        element_flags = _SparseIdFlags()
+        for ent_id, code in zip(self.ids, self.type_codes):
+            if ZONE_MASK[code]:
+                zone_flags[ent_id] = 1
+            elif ELEMENT_MASK[code]:
+                element_flags[ent_id] = 1
+        return zone_flags, element_flags
+
+
+# Use dense (indexed by id) flag tables while the largest id is below
+# this many times the number of entities.
+DENSE_ID_FACTOR = 10
+
+
+class _SparseIdFlags(dict):
+    """
+    Dict fallback of EntityTable.id_flags(): ids that are not stored
+    read as 0, like the unset bytes of the dense bytearray.
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, ent_id: int) -> int:
+        return 0
+
+
+IdFlags = Union[bytearray, _SparseIdFlags]
+
+
 def parse_selected_ifc_lines(
-    lines: List[Tuple[int, str, str]]
-) -> Tuple[Dict[int, IfcEntity], List[IfcRelationship]]:
+    lines: Iterable[Tuple[int, str, str]]
+) -> Tuple[EntityTable, List[IfcRelationship]]:
     """
     Parse the selected IFC lines (from Step 2) into:
 
-        entities:      { ifc_id → IfcEntity }
+        entities:      EntityTable (ifc_id → type, name, global_id)
         relationships: [ IfcRelationship ]
 
+    `lines` can be a list or a generator such as iter_ifc_statements();
+    each line is consumed once and its raw args string is not kept.
+
     We still stay in the IFC world here:
     - We understand which ids are entities, which are relations.
     - But we have not yet mapped anything to BOT classes or properties.
     """
 
-    entities: Dict[int, IfcEntity] = {}
+    entities = EntityTable()
     relationships: List[IfcRelationship] = []
 
     for ent_id, ent_type, args_str in lines:
+        code = _TYPE_LOOKUP.get(ent_type)
+        if code is None:
+            continue
+
         # CASE A: IFC entities (zones, elements, project)
-        if ent_type in IFC_TO_BOT_ZONE or ent_type in IFC_TO_BOT_ELEMENT or ent_type == "IFCPROJECT":
+        if code in ENTITY_CODES:
             # Very simple extraction: first two string attributes
             # are taken as (global_id, name).
             # Pattern: 'GLOBALID','NAME',...
-            m_args = re.match(r"'([^']*)'\s*,\s*'([^']*)'", args_str)
+            m_args = _RE_TWO_STRINGS.match(args_str)
             global_id = m_args.group(1) if m_args else ""
             name = m_args.group(2) if m_args else ""
 
-            entities[ent_id] = IfcEntity(ent_id, ent_type, name, global_id)
+            entities.add(ent_id, code, name, global_id)
 
         # CASE B: IFC relationships
-        elif ent_type in IFC_REL_TO_BOT_PROP:
+        elif code in RELATIONSHIP_CODES:
             # We just need the #numbers involved.
-            nums = re.findall(r"#(\d+)", args_str)
-            if len(nums) >= 2:
-                parent_id = int(nums[0])
-                child_ids = [int(n) for n in nums[1:]]
+            ids = _relationship_ids(args_str)
+            if ids is not None:
+                parent_id, child_ids = ids
                 relationships.append(
-                    IfcRelationship(ent_id, ent_type, parent_id, child_ids)
+                    IfcRelationship(ent_id, code, parent_id, child_ids)
                 )
 
-        # Other IFC types are not included in IFC_TYPES_OF_INTEREST,
-        # so they never appear here.
+        # Other IFC types have no TypeCode and were skipped above.
+
+    return entities, relationships
+
+
+# 3.1 Parallel variant of Steps 2 + 3 for large files
+#     The file is cut into byte ranges that start at a statement head, each
+#     range is scanned and parsed in its own process, and the partial
+#     results are concatenated in file order. Step 4 needs the complete
+#     entity table, so it stays in the main process.
+
+# Files smaller than this are not worth the process start-up cost.
+PARALLEL_MIN_FILE_SIZE = 64 << 20
+
+
+# Same as _RE_STATEMENT_HEAD, for the raw bytes of the file.
+_RE_STATEMENT_HEAD_BYTES = re.compile(rb"\n#\d+\s*=")
+
+
+def _split_file_ranges(ifc_path: str, n: int) -> List[Tuple[int, int]]:
+    """
+    Split the file into at most n (start, end) byte ranges of about the
+    same size, each starting at a statement head "#<id> =" that starts a
+    line (a ';' is not a safe cut, it can sit inside a quoted name).
+    """
+    with open(ifc_path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        bounds = [0]
+        for i in range(1, n):
+            pos = mm.find(b"\n#", max(size * i // n, bounds[-1]))
+            while pos >= 0 and not _RE_STATEMENT_HEAD_BYTES.match(mm, pos):
+                pos = mm.find(b"\n#", pos + 1)
+            if pos < 0:
+                break
+            bounds.append(pos + 1)
+        bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:])
+            if start < end]
+
+
+def _parse_file_range(
+    job: Tuple[str, int, int]
+) -> Tuple[EntityTable, List[IfcRelationship]]:
+    """
+    Worker: Steps 2 + 3 for the bytes [start, end) of the file,
+    read and decoded IFC_READ_CHUNK_SIZE bytes at a time. Newlines are
+    translated to "\n" like open(..., "r") does in iter_ifc_statements().
+    """
+    ifc_path, start, end = job
+
+    def chunks() -> Iterator[str]:
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="ignore"),
+            translate=True)
+        remaining = end - start
+        with open(ifc_path, "rb") as f:
+            f.seek(start)
+            while remaining > 0:
+                data = f.read(min(IFC_READ_CHUNK_SIZE, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield decoder.decode(data)
+        yield decoder.decode(b"", final=True)
+
+    return parse_selected_ifc_lines(_scan_chunks(chunks()))
+
+
+def parse_ifc_file_parallel(
+    ifc_path: str, workers: int
+) -> Tuple[EntityTable, List[IfcRelationship]]:
+    """
+    Same result as parse_selected_ifc_lines(iter_ifc_statements(ifc_path)),
+    but with the scanning and parsing spread over `workers` processes.
+    """
+    jobs = [(ifc_path, start, end)
+            for start, end in _split_file_ranges(ifc_path, workers)]
+
+    entities = EntityTable()
+    relationships: List[IfcRelationship] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part_entities, part_relationships in pool.map(
+                _parse_file_range, jobs):
+            entities.extend(part_entities)
+            relationships.extend(part_relationships)
 
     return entities, relationships
 
@@ -256,158 +771,247 @@ def classify_ifc_entity(ent: IfcEntity) -> Optional[str]:
         IFCSPACE          → "bot:Space"
         IFCWALL           → "bot:Element"
     """
-    if ent.type in IFC_TO_BOT_ZONE:
-        return IFC_TO_BOT_ZONE[ent.type]
-    if ent.type in IFC_TO_BOT_ELEMENT:
-        return IFC_TO_BOT_ELEMENT[ent.type]
-    return None
+    return BOT_CLASS_BY_CODE.get(ent.type)
+
+
+# 4.2 Relationship handlers, one per IFC relationship type.
+#     Each adds the BOT object-property triples of one relationship to
+#     ctx.by_subject in bulk (one list extend per relationship, not one
+#     append per triple). Subjects are always zones or elements, so 4.1
+#     already created their by_subject entry.
+
+SubjectProps = Dict[str, List[Tuple[str, str]]]
+
+
+class _TripleContext:
+    """
+    Per-run state shared by the relationship handlers:
+        zone_flags / element_flags : id → 1 if the id is a zone / an
+                                     element (EntityTable.id_flags())
+        curie                  : entity id → shared "ex:inst_<id>" string
+        by_subject             : the output being built
+        symmetric_pairs        : (low_id, rel_type, high_id) keys of the
+                                 symmetric relations already emitted
+    """
+
+    __slots__ = ("zone_flags", "element_flags", "curie", "by_subject",
+                 "symmetric_pairs")
+
+    def __init__(self, zone_flags: IdFlags, element_flags: IdFlags,
+                 curie: Dict[int, str], by_subject: SubjectProps):
+        self.zone_flags = zone_flags
+        self.element_flags = element_flags
+        self.curie = curie
+        self.by_subject = by_subject
+        self.symmetric_pairs: Set[Tuple[int, int, int]] = set()
+
+
+def _aggregates_triples(rel: IfcRelationship, ctx: _TripleContext) -> None:
+    # IFCRELAGGREGATES → containsZone or hasSubElement
+    parent_id = rel.parent_id
+    if ctx.zone_flags[parent_id]:
+        flags, prop = ctx.zone_flags, "bot:containsZone"
+    elif ctx.element_flags[parent_id]:
+        flags, prop = ctx.element_flags, "bot:hasSubElement"
+    else:
+        return
+    # Mixed cases (zone-element or element-zone) are ignored here.
+    curie = ctx.curie
+    ctx.by_subject[curie[parent_id]].extend(
+        [(prop, curie[cid]) for cid in rel.child_ids if flags[cid]])
+
+
+def _containment_triples(rel: IfcRelationship, ctx: _TripleContext) -> None:
+    # IFCRELCONTAINEDINSPATIALSTRUCTURE → containsElement
+    parent_id = rel.parent_id
+    if not ctx.zone_flags[parent_id]:
+        return
+    curie, element_flags = ctx.curie, ctx.element_flags
+    ctx.by_subject[curie[parent_id]].extend(
+        [("bot:containsElement", curie[cid])
+         for cid in rel.child_ids if element_flags[cid]])
+
+
+def _symmetric_triples(rel: IfcRelationship, prop: str,
+                       ctx: _TripleContext) -> None:
+    # Element ↔ Element, emitted in both directions.
+    # A pair is emitted once per relation type, even if the IFC file
+    # also states it the other way round (b ↔ a), as some exporters do.
+    if len(rel.child_ids) == 2:
+        a_id, b_id = rel.child_ids
+        if ctx.element_flags[a_id] and ctx.element_flags[b_id]:
+            key = ((a_id, rel.type, b_id) if a_id <= b_id
+                   else (b_id, rel.type, a_id))
+            if key in ctx.symmetric_pairs:
+                return
+            ctx.symmetric_pairs.add(key)
+
+            a, b = ctx.curie[a_id], ctx.curie[b_id]
+            ctx.by_subject[a].append((prop, b))
+            ctx.by_subject[b].append((prop, a))
+
+
+def _adjacency_triples(rel: IfcRelationship, ctx: _TripleContext) -> None:
+    # IFCRELCONNECTSELEMENTS → adjacentElement (symmetric)
+    _symmetric_triples(rel, "bot:adjacentElement", ctx)
+
+
+def _interference_triples(rel: IfcRelationship, ctx: _TripleContext) -> None:
+    # IFCRELINTERFERESELEMENTS → intersectingElement (symmetric)
+    _symmetric_triples(rel, "bot:intersectingElement", ctx)
+
+
+RELATIONSHIP_HANDLERS = {
+    TypeCode.IFCRELAGGREGATES: _aggregates_triples,
+    TypeCode.IFCRELCONTAINEDINSPATIALSTRUCTURE: _containment_triples,
+    TypeCode.IFCRELCONNECTSELEMENTS: _adjacency_triples,
+    TypeCode.IFCRELINTERFERESELEMENTS: _interference_triples,
+}
 
 
 def ifc_to_bot_triples(
-    entities: Dict[int, IfcEntity],
+    entities: EntityTable,
     relationships: List[IfcRelationship]
-) -> List[Tuple[str, str, str]]:
+) -> SubjectProps:
     """
     Convert IFC entities + relationships into RDF triples using BOT.
 
     OUTPUT:
-        triples: List of (subject, predicate, object)
-                 where s, p, o are CURIEs or literals (quoted).
+        by_subject: { subject → [ (predicate, object) ] }
+                    where s, p, o are CURIEs or literals (quoted).
+                    Triples are grouped by subject as they are produced,
+                    in first-seen order, which is exactly what the Turtle
+                    writer needs — no flat triple list is built.
     """
 
-    triples: List[Tuple[str, str, str]] = []
+    by_subject: SubjectProps = {}
 
-    # Small helpers by id
-    def is_zone_id(ifc_id: int) -> bool:
-        e = entities.get(ifc_id)
-        return e is not None and e.type in IFC_TO_BOT_ZONE
+    # Zone / element flag per id, covering every id a relationship refers
+    # to, so the handlers check each child with a single index lookup.
+    # (A relationship built by hand may have no children at all.)
+    max_ref_id = max(
+        max(entities.ids, default=0),
+        max(map(attrgetter("parent_id"), relationships), default=0),
+        max((max(rel.child_ids, default=0) for rel in relationships),
+            default=0))
+    zone_flags, element_flags = entities.id_flags(max_ref_id)
 
-    def is_element_id(ifc_id: int) -> bool:
-        e = entities.get(ifc_id)
-        return e is not None and e.type in IFC_TO_BOT_ELEMENT
+    # One CURIE string per entity, formatted once and shared by every
+    # triple (and by_subject key) that mentions the entity.
+    curie = {eid: f"ex:inst_{eid}" for eid in entities.ids}
 
     # 4.1 Create rdf:type + rdfs:label triples for each instance
-    for ent_id, ent in entities.items():
-        bot_class = classify_ifc_entity(ent)
+    for ent_id, code, name in zip(entities.ids, entities.type_codes,
+                                  entities.names):
+        bot_class = BOT_CLASS_BY_CODE.get(code)
         if bot_class is None:
             # Example: IFCPROJECT => not mapped to BOT in this adapter
             continue
 
-        subj = f"ex:inst_{ent_id}"
+        subj = curie[ent_id]
 
         # type triple
-        triples.append((subj, "rdf:type", bot_class))
+        props = [("rdf:type", bot_class)]
 
         # optional label triple from IFC name
-        if ent.name:
-            safe_name = ent.name.replace('"', '\\"')
-            triples.append((subj, "rdfs:label", f"\"{safe_name}\""))
+        if name:
+            safe_name = name.replace('"', '\\"')
+            props.append(("rdfs:label", f"\"{safe_name}\""))
+
+        by_subject[subj] = props
 
     # 4.2 Convert relationships to BOT object properties
+    ctx = _TripleContext(zone_flags, element_flags, curie, by_subject)
     for rel in relationships:
-        parent_id = rel.parent_id
-        child_ids = rel.child_ids
-
-        parent_curie = f"ex:inst_{parent_id}"
-        children_curie = [f"ex:inst_{cid}" for cid in child_ids]
-
-        # IFCRELAGGREGATES → containsZone or hasSubElement
-        if rel.type == "IFCRELAGGREGATES":
-            for cid, child_curie in zip(child_ids, children_curie):
-                if is_zone_id(parent_id) and is_zone_id(cid):
-                    triples.append((parent_curie, "bot:containsZone", child_curie))
-                elif is_element_id(parent_id) and is_element_id(cid):
-                    triples.append((parent_curie, "bot:hasSubElement", child_curie))
-                # Mixed cases (zone-element or element-zone) are ignored here.
-
-        # IFCRELCONTAINEDINSPATIALSTRUCTURE → containsElement
-        elif rel.type == "IFCRELCONTAINEDINSPATIALSTRUCTURE":
-            for cid, child_curie in zip(child_ids, children_curie):
-                if is_zone_id(parent_id) and is_element_id(cid):
-                    triples.append((parent_curie, "bot:containsElement", child_curie))
-
-        # IFCRELCONNECTSELEMENTS → adjacentElement (symmetric)
-        elif rel.type == "IFCRELCONNECTSELEMENTS":
-            if len(child_ids) == 2:
-                a_id, b_id = child_ids
-                if is_element_id(a_id) and is_element_id(b_id):
-                    a, b = children_curie
-                    triples.append((a, "bot:adjacentElement", b))
-                    triples.append((b, "bot:adjacentElement", a))
-
-        # IFCRELINTERFERESELEMENTS → intersectingElement (symmetric)
-        elif rel.type == "IFCRELINTERFERESELEMENTS":
-            if len(child_ids) == 2:
-                a_id, b_id = child_ids
-                if is_element_id(a_id) and is_element_id(b_id):
-                    a, b = children_curie
-                    triples.append((a, "bot:intersectingElement", b))
-                    triples.append((b, "bot:intersectingElement", a))
-
-    return triples
-
-
-def triples_to_ttl(triples: List[Tuple[str, str, str]]) -> str:
-    """
-    Render a list of (s, p, o) triples as Turtle A-BOX text.
+        handler = RELATIONSHIP_HANDLERS.get(rel.type)
+        if handler is not None:
+            handler(rel, ctx)
+
+    return by_subject
+
+
+# Prefixes must match what you use in Jena and in your T-box file.
+TTL_PREFIXES: List[str] = [
+    '@prefix rdf:  <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .',
+    '@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .',
+    '@prefix bot:  <https://w3id.org/bot#> .',
+    '@prefix ex:   <http://example.com/instances#> .',
+]
+
+
+def write_ttl(by_subject: SubjectProps, fp: TextIO) -> None:
+    """
+    Write triples grouped by subject (as returned by ifc_to_bot_triples())
+    as Turtle A-BOX text to an open text file.
+
+    Each subject block is written as soon as it is formatted, so the
+    Turtle output is never held in memory as one big string.
 
     NOTE:
     - We include only instance data here.
     - Your T-BOX (schema) ontology is defined and loaded separately.
     """
 
-    lines: List[str] = []
-
-    # Prefixes must match what you use in Jena and in your T-box file.
-    lines.append('@prefix rdf:  <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .')
-    lines.append('@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .')
-    lines.append('@prefix bot:  <https://w3id.org/bot#> .')
-    lines.append('@prefix ex:   <http://example.com/instances#> .')
-    lines.append('')
-
-    # Group triples by subject for nicer formatting
-    by_subject: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
-    for s, p, o in triples:
-        by_subject[s].append((p, o))
+    for prefix in TTL_PREFIXES:
+        fp.write(prefix + "\n")
 
+    # One write per subject block: predicate lines are joined with " ;"
+    # and the block ends with " ." (no per-line separator logic).
     for subj, props in by_subject.items():
-        lines.append(subj)
-        for i, (p, o) in enumerate(props):
-            sep = " ;" if i < len(props) - 1 else " ."
-            lines.append(f"    {p} {o}{sep}")
-        lines.append("")
+        parts = ["    " + p + " " + o for p, o in props]
+        fp.write("\n" + subj + "\n" + " ;\n".join(parts) + " .\n")
+
 
-    return "\n".join(lines)
+def triples_to_ttl(by_subject: SubjectProps) -> str:
+    """
+    Render triples grouped by subject as Turtle A-BOX text (same output
+    as write_ttl(), returned as a string).
+    """
+    out = io.StringIO()
+    write_ttl(by_subject, out)
+    return out.getvalue()
 
 
 # OPTIONAL: Small helper to run whole pipeline on a file.
 # You can keep or delete this to match your thesis constraints.
-def convert_ifc_file_to_ttl(ifc_path: str, ttl_path: str) -> None:
+def convert_ifc_file_to_ttl(ifc_path: str, ttl_path: str,
+                            workers: int = 1) -> None:
     """
     Convenience wrapper:
       IFC file  →  BOT A-box TTL file
 
+    If ttl_path ends with ".gz", the Turtle is written gzip-compressed.
+
+    By default the file is streamed in a single process. With workers > 1,
+    files of at least PARALLEL_MIN_FILE_SIZE bytes are scanned and parsed
+    by that many processes instead (on spawn platforms the caller's script
+    then needs an `if __name__ == "__main__":` guard).
+
     Usage (from terminal):
       >>> convert_ifc_file_to_ttl("mybuilding.ifc", "mybuilding.ttl")
+      >>> convert_ifc_file_to_ttl("mybuilding.ifc", "mybuilding.ttl.gz")
+      >>> convert_ifc_file_to_ttl("mybuilding.ifc", "mybuilding.ttl", workers=8)
     """
-    with open(ifc_path, "r", encoding="utf-8", errors="ignore") as f:
-        ifc_text = f.read()
-
-    # Step 2: scan & select
-    selected = scan_ifc_and_extract_lines(ifc_text)
-
-    # Step 3: parse into neutral IFC objects
-    entities, relationships = parse_selected_ifc_lines(selected)
-
-    # Step 4: map IFC → BOT triples
-    triples = ifc_to_bot_triples(entities, relationships)
-
-    # Render TTL
-    ttl_output = triples_to_ttl(triples)
-
-    # Save TTL to disk
-    with open(ttl_path, "w", encoding="utf-8") as f:
-        f.write(ttl_output)
+    if workers > 1 and os.path.getsize(ifc_path) >= PARALLEL_MIN_FILE_SIZE:
+        # Steps 2 + 3 in parallel over byte ranges of the file
+        entities, relationships = parse_ifc_file_parallel(ifc_path, workers)
+    else:
+        # Step 2: scan & select (streamed from disk, one chunk at a time)
+        selected = iter_ifc_statements(ifc_path)
+
+        # Step 3: parse into neutral IFC objects
+        entities, relationships = parse_selected_ifc_lines(selected)
+
+    # Step 4: map IFC → BOT triples, grouped by subject
+    by_subject = ifc_to_bot_triples(entities, relationships)
+
+    # Render TTL straight into the (buffered) output file
+    if ttl_path.endswith(".gz"):
+        out = gzip.open(ttl_path, "wt", encoding="utf-8")
+    else:
+        out = open(ttl_path, "w", encoding="utf-8")
+    with out:
+        write_ttl(by_subject, out)
 
 
 if __name__ == "__main__":
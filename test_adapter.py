@@ -0,0 +1,241 @@
+"""
+Regression checks for adapter.py.
+
+Run with:
+    python -m unittest test_adapter
+"""
+
+import os
+import tempfile
+import unittest
+
+import adapter
+
+
+# A ';' inside a quoted name must not be taken as the end of a statement.
+SEMICOLON_IFC = """ISO-10303-21;
+DATA;
+#10 = IFCPROJECT('PROJ-001','Demo; Project', $, $, $, $, $, $);
+#30 = IFCBUILDINGSTOREY('ST-01','Level 1; North', $, $, $, $, $, $);
+#100 = IFCWALL('W0','Plain wall',$);
+#101 = IFCWALL('W1','North wall; exterior face',$);
+#102 = IFCWALL('W2','East wall',$);
+#200 = IFCRELCONTAINEDINSPATIALSTRUCTURE('R1',$,$,$,#30,(#100,#101,#102));
+ENDSEC;
+END-ISO-10303-21;
+"""
+
+
+class ScanChunksTest(unittest.TestCase):
+
+    def setUp(self):
+        self._chunk_size = adapter.IFC_READ_CHUNK_SIZE
+
+    def tearDown(self):
+        adapter.IFC_READ_CHUNK_SIZE = self._chunk_size
+
+    def test_semicolon_in_name_at_every_chunk_boundary(self):
+        expected = list(adapter.scan_ifc_and_extract_lines(SEMICOLON_IFC))
+        self.assertEqual([ent_id for ent_id, _, _ in expected],
+                         [10, 30, 100, 101, 102, 200])
+
+        for size in range(1, len(SEMICOLON_IFC) + 1):
+            adapter.IFC_READ_CHUNK_SIZE = size
+            with self.subTest(chunk_size=size):
+                self.assertEqual(
+                    list(adapter.scan_ifc_and_extract_lines(SEMICOLON_IFC)),
+                    expected)
+
+    def test_statements_without_line_breaks(self):
+        expected = list(adapter.scan_ifc_and_extract_lines(SEMICOLON_IFC))
+        flat = SEMICOLON_IFC.replace("\n", "")
+        indented = SEMICOLON_IFC.replace("\n#", "\n  #")
+
+        # The buffer is cut before the last head, not kept whole.
+        self.assertEqual(adapter._last_statement_start(flat),
+                         flat.index("#200"))
+        self.assertEqual(adapter._last_statement_start(indented),
+                         indented.index("#200"))
+
+        for text in (flat, indented):
+            for size in range(1, len(text) + 1):
+                adapter.IFC_READ_CHUNK_SIZE = size
+                with self.subTest(chunk_size=size):
+                    self.assertEqual(
+                        list(adapter.scan_ifc_and_extract_lines(text)),
+                        expected)
+
+    def test_keywords_that_are_not_upper_case(self):
+        expected = list(adapter.scan_ifc_and_extract_lines(SEMICOLON_IFC))
+        lower = (SEMICOLON_IFC.replace("IFCPROJECT", "ifcproject")
+                 .replace("IFCBUILDINGSTOREY", "IfcBuildingStorey")
+                 .replace("IFCWALL", "IfcWall"))
+
+        for size in (1, 7, len(lower)):
+            adapter.IFC_READ_CHUNK_SIZE = size
+            with self.subTest(chunk_size=size):
+                self.assertEqual(
+                    list(adapter.scan_ifc_and_extract_lines(lower)),
+                    expected)
+
+
+class SplitFileRangesTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".ifc")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(SEMICOLON_IFC)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_ranges_start_at_statement_heads(self):
+        expected = list(adapter.scan_ifc_and_extract_lines(SEMICOLON_IFC))
+        data = SEMICOLON_IFC.encode("utf-8")
+
+        for n in range(2, len(data)):
+            ranges = adapter._split_file_ranges(self.path, n)
+            with self.subTest(workers=n):
+                scanned = []
+                for start, end in ranges:
+                    if start:
+                        self.assertEqual(data[start - 1:start + 1], b"\n#")
+                    scanned.extend(adapter.scan_ifc_and_extract_lines(
+                        data[start:end].decode("utf-8")))
+                self.assertEqual(scanned, expected)
+
+
+def _table_rows(entities, relationships):
+    return (list(zip(entities.ids, entities.type_codes, entities.names,
+                     entities.global_ids)),
+            [(r.id, r.type, r.parent_id, r.child_ids) for r in relationships])
+
+
+class ParseIfcFileParallelTest(unittest.TestCase):
+
+    def setUp(self):
+        # CRLF line endings and a name that spans two lines
+        ifc_text = SEMICOLON_IFC.replace("'Plain wall'", "'Plain\nwall'")
+        fd, self.path = tempfile.mkstemp(suffix=".ifc")
+        with os.fdopen(fd, "wb") as f:
+            f.write(ifc_text.replace("\n", "\r\n").encode("utf-8"))
+        self._min_size = adapter.PARALLEL_MIN_FILE_SIZE
+        adapter.PARALLEL_MIN_FILE_SIZE = 0
+
+    def tearDown(self):
+        adapter.PARALLEL_MIN_FILE_SIZE = self._min_size
+        os.remove(self.path)
+
+    def test_same_result_as_sequential(self):
+        expected = _table_rows(*adapter.parse_selected_ifc_lines(
+            adapter.iter_ifc_statements(self.path)))
+        self.assertIn("Plain\nwall", expected[0][2])
+
+        for workers in (2, 3, 5):
+            with self.subTest(workers=workers):
+                self.assertEqual(
+                    _table_rows(*adapter.parse_ifc_file_parallel(
+                        self.path, workers)),
+                    expected)
+
+    def test_ttl_does_not_depend_on_workers(self):
+        fd, ttl_path = tempfile.mkstemp(suffix=".ttl")
+        os.close(fd)
+        try:
+            outputs = []
+            for workers in (1, 4):
+                adapter.convert_ifc_file_to_ttl(self.path, ttl_path,
+                                                workers=workers)
+                with open(ttl_path, encoding="utf-8") as f:
+                    outputs.append(f.read())
+        finally:
+            os.remove(ttl_path)
+        self.assertEqual(outputs[0], outputs[1])
+
+
+class RelationshipIdsTest(unittest.TestCase):
+
+    def test_bracket_in_quoted_name_is_not_the_child_tuple(self):
+        ifc_text = SEMICOLON_IFC.replace(
+            "ENDSEC;",
+            "#300 = IFCRELCONNECTSELEMENTS("
+            "'C',#2,'Join (N-E)',$,$,#100,#101);\nENDSEC;")
+        entities, relationships = adapter.parse_selected_ifc_lines(
+            adapter.scan_ifc_and_extract_lines(ifc_text))
+
+        rel = next(r for r in relationships if r.id == 300)
+        self.assertEqual((rel.parent_id, rel.child_ids), (2, [100, 101]))
+
+        ttl = adapter.triples_to_ttl(
+            adapter.ifc_to_bot_triples(entities, relationships))
+        self.assertIn("bot:adjacentElement ex:inst_101", ttl)
+        self.assertIn("bot:adjacentElement ex:inst_100", ttl)
+
+
+def _with_relationships(*statements):
+    return SEMICOLON_IFC.replace(
+        "ENDSEC;", "\n".join(statements) + "\nENDSEC;")
+
+
+def _bot_triples(ifc_text):
+    return adapter.ifc_to_bot_triples(*adapter.parse_selected_ifc_lines(
+        adapter.scan_ifc_and_extract_lines(ifc_text)))
+
+
+class SymmetricTriplesTest(unittest.TestCase):
+
+    def test_reversed_and_repeated_pair_is_emitted_once(self):
+        by_subject = _bot_triples(_with_relationships(
+            "#300 = IFCRELCONNECTSELEMENTS('C1',#2,'N-E',$,$,#100,#101);",
+            "#301 = IFCRELCONNECTSELEMENTS('C2',#2,'E-N',$,$,#101,#100);",
+            "#302 = IFCRELCONNECTSELEMENTS('C3',#2,'N-E',$,$,#100,#101);"))
+
+        adjacency = ("bot:adjacentElement", "ex:inst_101")
+        self.assertEqual(by_subject["ex:inst_100"].count(adjacency), 1)
+        adjacency = ("bot:adjacentElement", "ex:inst_100")
+        self.assertEqual(by_subject["ex:inst_101"].count(adjacency), 1)
+
+    def test_same_pair_under_another_relation_type(self):
+        by_subject = _bot_triples(_with_relationships(
+            "#300 = IFCRELCONNECTSELEMENTS('C1',#2,'N-E',$,$,#100,#101);",
+            "#400 = IFCRELINTERFERESELEMENTS('I1',#2,'N-E',$,$,#101,#100);"))
+
+        for subject, other in (("ex:inst_100", "ex:inst_101"),
+                               ("ex:inst_101", "ex:inst_100")):
+            with self.subTest(subject=subject):
+                props = by_subject[subject]
+                self.assertEqual(
+                    props.count(("bot:adjacentElement", other)), 1)
+                self.assertEqual(
+                    props.count(("bot:intersectingElement", other)), 1)
+
+
+class IfcToBotTriplesTest(unittest.TestCase):
+
+    def test_relationship_without_children(self):
+        entities, relationships = adapter.parse_selected_ifc_lines(
+            adapter.scan_ifc_and_extract_lines(SEMICOLON_IFC))
+        expected = adapter.ifc_to_bot_triples(entities, relationships)
+
+        relationships.append(adapter.IfcRelationship(
+            201, adapter.TypeCode.IFCRELCONTAINEDINSPATIALSTRUCTURE, 30, []))
+        self.assertEqual(adapter.ifc_to_bot_triples(entities, relationships),
+                         expected)
+
+
+class EntityTableTest(unittest.TestCase):
+
+    def test_ids_above_int32(self):
+        ifc_text = SEMICOLON_IFC.replace("#102 ", "#3000000000 ").replace(
+            "#102)", "#3000000000)")
+        entities, relationships = adapter.parse_selected_ifc_lines(
+            adapter.scan_ifc_and_extract_lines(ifc_text))
+
+        self.assertIn(3000000000, entities)
+        ttl = adapter.triples_to_ttl(
+            adapter.ifc_to_bot_triples(entities, relationships))
+        self.assertIn("bot:containsElement ex:inst_3000000000", ttl)
+
+
+if __name__ == "__main__":
+    unittest.main()